@@ -92,6 +92,8 @@ class BatsimRequest(ABC):
         AssertionError: In case of invalid arguments type.
     """
 
+    __slots__ = ('__timestamp', '__type')
+
     def __init__(self, timestamp: float, request_type: BatsimRequestType) -> None:
         assert isinstance(request_type, BatsimRequestType)
         self.__timestamp = float(timestamp)
@@ -181,17 +183,32 @@ class BatsimMessage:
             event timestamp.
     """
 
+    __slots__ = ('__now', '__events')
+
     def __init__(self,
                  now: float,
                  batsim_events: Sequence[Union[BatsimRequest, BatsimEvent]] = ()) -> None:
 
-        if any(e.timestamp > now for e in batsim_events):
-            raise ValueError('Expected `now` argument to be greather than '
-                             'or equal to every event timestamp, got now={} '
-                             'and events={}'.format(now, batsim_events))
         self.__now = float(now)
-        # Events timestamps must be in (non-strictly) ascending order.
-        self.__events = sorted(batsim_events, key=lambda e: e.timestamp)
+        # Events timestamps must be in (non-strictly) ascending order. They
+        # are validated and checked for order in a single pass, and sorted
+        # only when some event is actually out of order.
+        events = list(batsim_events)
+        previous_t: Optional[float] = None
+        needs_sort = False
+        for e in events:
+            t = e.timestamp
+            if t > now:
+                raise ValueError('Expected `now` argument to be greather than '
+                                 'or equal to every event timestamp, got now={} '
+                                 'and events={}'.format(now, batsim_events))
+            if previous_t is not None and t < previous_t:
+                needs_sort = True
+            previous_t = t
+
+        if needs_sort:
+            events.sort(key=lambda e: e.timestamp)
+        self.__events = events
 
     @property
     def now(self) -> float:
@@ -212,7 +229,7 @@ class BatsimMessage:
         jsn = {
             "now": self.now,
             "events": [
-                e.to_json() for e in self.events if isinstance(e, BatsimRequest)
+                e.to_json() for e in self.__events if isinstance(e, BatsimRequest)
             ]
         }
         return jsn
@@ -666,6 +683,8 @@ class NotifyBatsimRequest(BatsimRequest):
         notify_type: The notification type.
     """
 
+    __slots__ = ('notify_type',)
+
     def __init__(self, timestamp: float, notify_type: BatsimNotifyType) -> None:
         assert isinstance(notify_type, BatsimNotifyType)
         super().__init__(timestamp, BatsimRequestType.NOTIFY)
@@ -693,6 +712,8 @@ class RejectJobBatsimRequest(BatsimRequest):
         job_id: The job id to be rejected.
     """
 
+    __slots__ = ('job_id',)
+
     def __init__(self, timestamp: float, job_id: str) -> None:
         super().__init__(timestamp, BatsimRequestType.REJECT_JOB)
         self.job_id = job_id
@@ -726,6 +747,8 @@ class ExecuteJobBatsimRequest(BatsimRequest):
         alloc: the job allocated resources.
     """
 
+    __slots__ = ('job_id', 'storage_mapping', 'alloc')
+
     def __init__(self,
                  timestamp: float,
                  job_id: str,
@@ -773,6 +796,8 @@ class CallMeLaterBatsimRequest(BatsimRequest):
         at: The time which batsim must callback.
     """
 
+    __slots__ = ('at',)
+
     def __init__(self, timestamp: float, at: float) -> None:
         if timestamp >= at:
             raise ValueError('Expected `timestamp` argument to be less than the '
@@ -809,6 +834,8 @@ class KillJobBatsimRequest(BatsimRequest):
         job_ids: A sequence of ids of the jobs to be killed.
     """
 
+    __slots__ = ('job_ids',)
+
     def __init__(self, timestamp: float, *job_id: str) -> None:
         super().__init__(timestamp, BatsimRequestType.KILL_JOB)
         self.job_ids = list(job_id)
@@ -841,6 +868,8 @@ class RegisterJobBatsimRequest(BatsimRequest):
         job: The registered job.
     """
 
+    __slots__ = ('job',)
+
     def __init__(self, timestamp: float, job: Job) -> None:
         super().__init__(timestamp, BatsimRequestType.REGISTER_JOB)
         assert isinstance(job, Job)
@@ -890,6 +919,8 @@ class RegisterProfileBatsimRequest(BatsimRequest):
         profile: The registered profile.
     """
 
+    __slots__ = ('workload_name', 'profile')
+
     def __init__(self, timestamp: float, workload_name: str, profile: JobProfile) -> None:
         super().__init__(timestamp, BatsimRequestType.REGISTER_PROFILE)
         assert isinstance(profile, JobProfile)
@@ -930,6 +961,8 @@ class SetResourceStateBatsimRequest(BatsimRequest):
         state: The resource power state id to switch.
     """
 
+    __slots__ = ('resources', 'state')
+
     def __init__(self,
                  timestamp: float,
                  resources: Sequence[int],
@@ -980,6 +1013,8 @@ class ChangeJobStateBatsimRequest(BatsimRequest):
         kill_reason: The motivation to change the job state.
     """
 
+    __slots__ = ('job_id', 'job_state', 'kill_reason')
+
     def __init__(self,
                  timestamp: float,
                  job_id: str,
@@ -1060,6 +1095,7 @@ class NetworkHandler:
         self.__address = str(address)
         self.__context = zmq.Context()
         self.__socket: zmq.Socket = None
+        self.__decoder = BatsimMessageDecoder()
 
     @property
     def address(self) -> str:
@@ -1117,7 +1153,7 @@ class NetworkHandler:
         if not self.is_connected:
             raise SystemError("Connection not opened.")
 
-        return self.__socket.recv_json(object_hook=BatsimMessageDecoder())
+        return self.__socket.recv_json(object_hook=self.__decoder)
 
     def send_and_recv(self, msg: BatsimMessage) -> BatsimMessage:
         """ Send a message and wait for a response.
@@ -1,5 +1,6 @@
 import atexit
 from collections import defaultdict
+import heapq
 import math
 from shutil import which
 import signal
@@ -10,10 +11,12 @@ from typing import Dict
 from typing import Callable, Union
 from typing import Union
 from typing import Sequence
+from typing import Set
 from typing import List
 from typing import DefaultDict
 from typing import Optional
 from typing import Iterator
+from typing import Tuple
 from typing import overload
 from typing import Literal
 
@@ -93,6 +96,17 @@ class SimulatorHandler:
         >>> handler = SimulatorHandler("tcp://localhost:28000")
     """
 
+    __slots__ = ('__network', '__current_time', '__current_time_floor',
+                 '__simulator', '__simulation_time', '__platform',
+                 '__no_more_jobs_to_submit',
+                 '__no_more_external_event_to_occur', '__batsim_requests',
+                 '__pending_call_times', '__pstate_request_index', '__jobs',
+                 '__jobs_by_id', '__queue', '__runnable',
+                 '__runnable_by_host', '__callbacks', '__callback_times',
+                 '__subscriptions', '__batsim_event_handlers',
+                 '__batsim_event_handler_table', '__wait_callback',
+                 'subprocess_timeout')
+
     def __init__(self, tcp_address: Optional[str] = None, subprocess_timeout=60) -> None:
         if which('batsim') is None:
             raise ImportError('(HINT: you need to install Batsim. '
@@ -101,14 +115,23 @@ class SimulatorHandler:
                               'Run "batsim --version" to make sure it is working.')
         self.__network = NetworkHandler(tcp_address or get_free_tcp_address())
         self.__current_time: float = 0.
+        self.__current_time_floor: int = 0
         self.__simulator: Optional[subprocess.Popen] = None
         self.__simulation_time: Optional[float] = None
         self.__platform: Platform = None  # type: ignore
         self.__no_more_jobs_to_submit = False
         self.__no_more_external_event_to_occur = False
         self.__batsim_requests: List[BatsimRequest] = []
+        self.__pending_call_times: Set[float] = set()
+        self.__pstate_request_index: Dict[Tuple[float, int],
+                                          SetResourceStateBatsimRequest] = {}
         self.__jobs: List[Job] = []
+        self.__jobs_by_id: Dict[str, Job] = {}
+        self.__queue: Dict[str, Job] = {}
+        self.__runnable: Set[Job] = set()
+        self.__runnable_by_host: DefaultDict[int, Set[Job]] = defaultdict(set)
         self.__callbacks: Callbacks = defaultdict(list)
+        self.__callback_times: List[float] = []
         self.__subscriptions: Listeners = defaultdict(list)
 
         #added params
@@ -125,6 +148,14 @@ class SimulatorHandler:
             BatsimEventType.NOTIFY: self.__on_batsim_notify
         }
 
+        # Dense dispatch table indexed by the enum value. Event types
+        # without a handler (e.g. JOB_KILLED) stay None and are skipped.
+        max_value = max(e.value for e in BatsimEventType)
+        self.__batsim_event_handler_table: List[Optional[Callable]] = \
+            [None] * (max_value + 1)
+        for event_type, handler in self.__batsim_event_handlers.items():
+            self.__batsim_event_handler_table[event_type.value] = handler
+
         atexit.register(self.__close_simulator)
         signal.signal(signal.SIGTERM, self.__on_sigterm)
 
@@ -144,21 +175,22 @@ class SimulatorHandler:
     @property
     def queue(self) -> Sequence[Job]:
         """ A sequence of all jobs in the queue. """
-        return [j for j in self.__jobs if j.is_submitted]
+        return list(self.__queue.values())
 
     @property
     def agenda(self) -> Iterator[Reservation]:
         """ Host reservations. """
         if self.__platform:
+            now = self.current_time
             for host in self.__platform.hosts:
                 release_t = 0.
                 for job_id in host.jobs:
-                    job = next(j for j in self.__jobs if j.id == job_id)
+                    job = self.__jobs_by_id[job_id]
                     if job.walltime:
                         runtime = 0.
                         if job.is_running or job.is_finished:
                             assert job.start_time is not None
-                            runtime = self.current_time - job.start_time
+                            runtime = now - job.start_time
                         job_release_t = job.walltime - runtime
                     else:
                         job_release_t = np.inf
@@ -179,7 +211,7 @@ class SimulatorHandler:
     @property
     def current_time(self) -> int:
         """ The current simulation time (seconds). """
-        return math.floor(self.__current_time)
+        return self.__current_time_floor
 
     @property
     def is_submitter_finished(self) -> bool:
@@ -242,7 +274,11 @@ class SimulatorHandler:
                              f'than zero, got {simulation_time}.')
 
         self.__jobs = []
-        self.__current_time = 0.
+        self.__jobs_by_id = {}
+        self.__queue = {}
+        self.__runnable = set()
+        self.__runnable_by_host = defaultdict(set)
+        self.__set_current_time(0.)
         self.__simulation_time = simulation_time
         self.__no_more_jobs_to_submit = False
 
@@ -267,7 +303,7 @@ class SimulatorHandler:
             self.__no_more_external_event_to_occur = True
 
         self.__simulator = subprocess.Popen(
-            cmd.split(), stdout=subprocess.PIPE)
+            cmd.split(), stdout=subprocess.DEVNULL)
 
         self.__network.bind()
 
@@ -284,7 +320,10 @@ class SimulatorHandler:
             self.__network.close()
             self.__simulation_time = None
             self.__batsim_requests.clear()
+            self.__pending_call_times.clear()
+            self.__pstate_request_index.clear()
             self.__callbacks.clear()
+            self.__callback_times.clear()
             self.__dispatch_event(SimulatorEvent.SIMULATION_ENDS, self)
 
     def proceed_time(self, time: int = 0) -> None:
@@ -324,9 +363,10 @@ class SimulatorHandler:
             self.__wait_callback = True
             self.set_callback(time + self.current_time, unflag)
 
-        self.__goto_next_batsim_event()
-        while self.is_running and self.__wait_callback:
-            self.__goto_next_batsim_event()
+        goto_next = self.__goto_next_batsim_event
+        goto_next()
+        while self.__simulator is not None and self.__wait_callback:
+            goto_next()
 
     @overload
     def subscribe(self, event: JobEvent, call: JobListener) -> None: ...
@@ -376,6 +416,8 @@ class SimulatorHandler:
                              'greater than the current simulation time'
                              f', got {at}.')
 
+        if at not in self.__callbacks:
+            heapq.heappush(self.__callback_times, at)
         self.__callbacks[at].append(call)
         self.__set_batsim_call_me_later(at)
 
@@ -410,7 +452,7 @@ class SimulatorHandler:
 
         assert self.__platform, "For some reason the platform was not loaded"
 
-        job = next((j for j in self.__jobs if j.id == job_id), None)
+        job = self.__jobs_by_id.get(job_id)
         if not job:
             raise LookupError("The job {} was not found.".format(job_id))
 
@@ -425,6 +467,8 @@ class SimulatorHandler:
 
         # Allocate job
         job._allocate(hosts_id, storage_mapping)
+        self.__queue.pop(job_id, None)
+        self.__track_runnable(job)
         self.__dispatch_event(JobEvent.ALLOCATED, job)
 
         # Start job
@@ -444,7 +488,7 @@ class SimulatorHandler:
         if not self.is_running:
             raise RuntimeError("The simulation is not running.")
 
-        job = next((j for j in self.__jobs if j.id == job_id), None)
+        job = self.__jobs_by_id.get(job_id)
         if not job:
             raise LookupError("The job {} was not found.".format(job_id))
 
@@ -475,12 +519,14 @@ class SimulatorHandler:
         if not self.is_running:
             raise RuntimeError("The simulation is not running.")
 
-        job = next((j for j in self.__jobs if j.id == job_id), None)
+        job = self.__jobs_by_id.get(job_id)
         if not job:
             raise LookupError("The job {} was not found.".format(job_id))
 
         job._reject()
         self.__jobs.remove(job)
+        del self.__jobs_by_id[job_id]
+        self.__queue.pop(job_id, None)
 
         # Sync Batsim
         request = RejectJobBatsimRequest(self.current_time, job_id)
@@ -504,8 +550,9 @@ class SimulatorHandler:
 
         assert self.__platform, "For some reason, the platform was not loaded."
 
+        get_host = self.__platform.get_host
         for h_id in hosts_id:
-            host = self.__platform.get_host(h_id)
+            host = get_host(h_id)
             host._switch_on()
             ending_pstate = host.get_default_pstate()
 
@@ -553,8 +600,9 @@ class SimulatorHandler:
 
         assert self.__platform, "For some reason, the platform was not loaded."
 
+        get_host = self.__platform.get_host
         for h_id in hosts_id:
-            host = self.__platform.get_host(h_id)
+            host = get_host(h_id)
             host._switch_off()
             ending_pstate = host.get_sleep_pstate()
 
@@ -603,24 +651,52 @@ class SimulatorHandler:
         for call in self.__subscriptions[event]:
             call(sender)  # type: ignore
 
-    def __start_runnable_jobs(self) -> None:
+    def __track_runnable(self, job: Job) -> None:
+        """ Register an allocated job as waiting for its hosts. """
+        assert job.allocation, "For some reason, the job was not allocated."
+        self.__runnable.add(job)
+        for h_id in job.allocation:
+            self.__runnable_by_host[h_id].add(job)
+
+    def __forget_runnable(self, job: Job) -> None:
+        """ Drop a job from the runnable bookkeeping. """
+        self.__runnable.discard(job)
+        if job.allocation:
+            for h_id in job.allocation:
+                jobs = self.__runnable_by_host.get(h_id)
+                if jobs:
+                    jobs.discard(job)
+                    if not jobs:
+                        del self.__runnable_by_host[h_id]
+
+    def __start_runnable_jobs(self, jobs: Optional[Set[Job]] = None) -> None:
         """ Start runnable jobs.
 
         This is an internal method used to starts jobs that were allocated. 
         A job can only starts if the hosts are idle. Thus, this method ensures 
         that the host can compute the job.
+
+        Args:
+            jobs: The runnable jobs to check. Defaults to None. If unset, all
+                runnable jobs are checked.
         """
         if not self.is_running:
             return
 
         assert self.__platform, "For some reason, the platform was not loaded."
 
-        runnable_jobs = [j for j in self.__jobs if j.is_runnable]
-        for job in runnable_jobs:
+        now = self.current_time
+        get_host = self.__platform.get_host
+        requests: List[BatsimRequest] = []
+        for job in list(jobs if jobs is not None else self.__runnable):
+            if not job.is_runnable:
+                self.__forget_runnable(job)
+                continue
+
             assert job.allocation, "For some reason, the job was not allocated."
 
             is_ready = True
-            hosts = [self.__platform.get_host(h) for h in job.allocation]
+            hosts = [get_host(h) for h in job.allocation]
             latest_ttr = max([host.time_to_ready for host in hosts])
             # Check if all hosts are active and switch on sleeping hosts at the right time?
             for host in hosts:
@@ -630,11 +706,12 @@ class SimulatorHandler:
                 if host.is_sleeping and not host.is_scheduled_to_switch_on:
                     latest_switch_on_time = latest_ttr-TIME_TO_SWITCH_ON
                     latest_switch_on_time = max(latest_switch_on_time, 0)
-                    latest_switch_on_time += self.current_time
+                    latest_switch_on_time += now
                     self.schedule_to_switch_on(host, latest_switch_on_time)
 
             if is_ready:
-                job._start(self.current_time)
+                self.__forget_runnable(job)
+                job._start(now)
                 for host in hosts:
                     if not host.is_computing:
                         host._start_computing()
@@ -642,11 +719,14 @@ class SimulatorHandler:
 
                 self.__dispatch_event(JobEvent.STARTED, job)
                 # Sync Batsim
-                request = ExecuteJobBatsimRequest(self.current_time,
+                request = ExecuteJobBatsimRequest(now,
                                                   job.id,
                                                   job.allocation,
                                                   job.storage_mapping)
-                self.__batsim_requests.append(request)
+                requests.append(request)
+
+        if requests:
+            self.__batsim_requests.extend(requests)
 
     def __goto_next_batsim_event(self) -> None:
         """ Go to the next Batsim event. """
@@ -661,27 +741,24 @@ class SimulatorHandler:
         """ Close the simulator process. """
         if self.__simulator:
             self.__simulator.terminate()
-            self.__simulator.communicate()
+            self.__simulator.wait(self.subprocess_timeout)
             self.__simulator = None
 
     def __set_batsim_call_me_later(self, at: float) -> None:
         """ Setup a call me later request. """
         at += 0.09  # Last batsim priority
+        if at in self.__pending_call_times:
+            return
+
         request = CallMeLaterBatsimRequest(self.current_time, at)
-        if not any(isinstance(r, CallMeLaterBatsimRequest) and r.at == request.at for r in self.__batsim_requests):
-            self.__batsim_requests.append(request)
+        self.__batsim_requests.append(request)
+        self.__pending_call_times.add(at)
 
     def __set_batsim_host_pstate(self, host_id: int, pstate_id: int) -> None:
         """ Set Batsim host power state. """
-        def get_old_request() -> Optional[SetResourceStateBatsimRequest]:
-            """ Get the request with the same properties. """
-            for r in self.__batsim_requests:
-                if r.timestamp == self.current_time and isinstance(r, SetResourceStateBatsimRequest) and r.state == pstate_id:
-                    return r
-            return None
-
         # We try to minimize the number of requests.
-        request = get_old_request()
+        key = (self.current_time, pstate_id)
+        request = self.__pstate_request_index.get(key)
 
         if request:
             request.add_resource(host_id)
@@ -689,23 +766,43 @@ class SimulatorHandler:
             request = SetResourceStateBatsimRequest(
                 self.current_time, [host_id], pstate_id)
             self.__batsim_requests.append(request)
+            self.__pstate_request_index[key] = request
+
+    def __set_current_time(self, time: float) -> None:
+        """ Set the current simulation time.
+
+        The floored value is computed once here so that the `current_time`
+        property is a plain attribute read in the scheduler hot paths.
+        """
+        self.__current_time = time
+        self.__current_time_floor = math.floor(time)
 
     def __handle_batsim_events(self) -> None:
         """ Handle Batsim events. """
         msg = self.__network.recv()
+        handler_table = self.__batsim_event_handler_table
+        t = self.__current_time
         for event in msg.events:
-            self.__current_time = event.timestamp
-            if event.type in self.__batsim_event_handlers:
+            # Events come in ascending order and often share a timestamp,
+            # so only store the time when it actually advances.
+            if event.timestamp != t:
+                t = event.timestamp
+                self.__set_current_time(t)
+            handler = handler_table[event.type.value]
+            if handler is not None:
                 assert isinstance(event.type, BatsimEventType)
-                self.__batsim_event_handlers[event.type](event)
+                handler(event)
 
-        self.__current_time = msg.now
+        if msg.now != t:
+            self.__set_current_time(msg.now)
 
     def __send_requests(self) -> None:
         """ Send Batsim requests. """
         msg = BatsimMessage(self.current_time, self.__batsim_requests)
         self.__network.send(msg)
         self.__batsim_requests.clear()
+        self.__pending_call_times.clear()
+        self.__pstate_request_index.clear()
 
     def __on_batsim_simulation_begins(self, event: SimulationBeginsBatsimEvent) -> None:
         self.__platform = event.platform
@@ -727,8 +824,9 @@ class SimulatorHandler:
         """
         assert self.__platform, "For some reason, the platform was not loaded."
 
+        get_host = self.__platform.get_host
         for h_id in event.resources:
-            h = self.__platform.get_host(h_id)
+            h = get_host(h_id)
             assert h.pstate
 
             if h.is_switching_off:
@@ -748,32 +846,45 @@ class SimulatorHandler:
                                                 '{} while batsim got pstate {}.'
                                                 ''.format(h.pstate.id, event.state))
 
-        self.__start_runnable_jobs()
+        # Only jobs waiting on the hosts that changed can become startable.
+        affected: Set[Job] = set()
+        get_waiting = self.__runnable_by_host.get
+        for h_id in event.resources:
+            jobs = get_waiting(h_id)
+            if jobs:
+                affected.update(jobs)
+
+        if affected:
+            self.__start_runnable_jobs(affected)
 
     def __on_batsim_requested_call(self, _) -> None:
         """ Handle batsim answer to call me back request.  """
-        for t in list(self.__callbacks.keys()):
-            if t <= self.__current_time:  # batsim time
-                for call in self.__callbacks.pop(t):
-                    call(self.current_time)  # local time
+        times = self.__callback_times
+        while times and times[0] <= self.__current_time:  # batsim time
+            t = heapq.heappop(times)
+            for call in self.__callbacks.pop(t):
+                call(self.current_time)  # local time
 
     def __on_batsim_job_submitted(self, event: JobSubmittedBatsimEvent) -> None:
         """ Handle batsim job submitted event.  """
         self.__jobs.append(event.job)
+        self.__jobs_by_id[event.job.id] = event.job
+        self.__queue[event.job.id] = event.job
         event.job._submit(self.current_time)
         self.__dispatch_event(JobEvent.SUBMITTED, event.job)
 
     def __on_batsim_job_completed(self, event: JobCompletedBatsimEvent) -> None:
         """ Handle batsim job submitted event.  """
 
-        job = next((j for j in self.__jobs if j.id == event.job_id), None)
+        job = self.__jobs_by_id.get(event.job_id)
         assert job, "The job {} was not found.".format(event.job_id)
         assert job.allocation and self.__platform
 
         job._terminate(self.current_time, event.job_state)
 
+        get_host = self.__platform.get_host
         for h_id in job.allocation:
-            host = self.__platform.get_host(h_id)
+            host = get_host(h_id)
             host._release(job.id)
             self.__dispatch_event(HostEvent.STATE_CHANGED, host)
 
@@ -782,6 +893,8 @@ class SimulatorHandler:
                 self.__platform.get_storage(s_id)._release(job.id)
 
         self.__jobs.remove(job)
+        del self.__jobs_by_id[job.id]
+        self.__forget_runnable(job)
         self.__dispatch_event(JobEvent.COMPLETED, job)
         self.__start_runnable_jobs()
 
@@ -82,7 +82,7 @@ class TestSimulatorHandler:
 
         s.start(platform, workload, verbosity)
         simulator.subprocess.Popen.assert_called_once_with(  # type: ignore
-            cmd.split(), stdout=subprocess.PIPE)
+            cmd.split(), stdout=subprocess.DEVNULL)
 
     def test_start_cmd_with_compute_sharing_enable(self):
         platform = "p.xml"
@@ -100,7 +100,7 @@ class TestSimulatorHandler:
 
         s.start(platform, workload, verbosity, allow_compute_sharing=True)
         simulator.subprocess.Popen.assert_called_once_with(  # type: ignore
-            cmd.split(), stdout=subprocess.PIPE)
+            cmd.split(), stdout=subprocess.DEVNULL)
 
     def test_start_cmd_with_storage_sharing_disable(self):
         platform = "p.xml"
@@ -118,7 +118,7 @@ class TestSimulatorHandler:
 
         s.start(platform, workload, verbosity, allow_storage_sharing=False)
         simulator.subprocess.Popen.assert_called_once_with(  # type: ignore
-            cmd.split(), stdout=subprocess.PIPE)
+            cmd.split(), stdout=subprocess.DEVNULL)
 
     def test_start_cmd_with_external_events(self):
         platform = "p.xml"
@@ -137,7 +137,7 @@ class TestSimulatorHandler:
 
         s.start(platform, workload, verbosity, external_events=events)
         simulator.subprocess.Popen.assert_called_once_with(  # type: ignore
-            cmd.split(), stdout=subprocess.PIPE)
+            cmd.split(), stdout=subprocess.DEVNULL)
 
     def test_start_already_running_must_raise(self):
         s = SimulatorHandler()